@@ -1,5 +1,6 @@
 import re
 import string
+from functools import lru_cache
 
 from snowddl.blueprint import AbstractIdent
 
@@ -38,6 +39,9 @@ class SnowDDLFormatter(string.Formatter):
 
         return sql
 
+    def parse(self, format_string):
+        return _parse_format_string(format_string)
+
     def convert_field(self, value, conversion):
         if conversion is not None:
             raise ValueError("Conversions are disabled for SnowDDLFormatter")
@@ -179,3 +183,9 @@ class SnowDDLFormatter(string.Formatter):
             return cls.safe_float(val)
         else:
             return cls.quote(val)
+
+
+@lru_cache(maxsize=512)
+def _parse_format_string(format_string):
+    # SQL templates are mostly static, parsed result is reused on subsequent calls
+    return tuple(string.Formatter().parse(format_string))
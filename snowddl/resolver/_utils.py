@@ -1,5 +1,9 @@
+import re
 from typing import Union
 
+arguments_dtypes_regexp = re.compile(r"[^(]*\((.*?)\) RETURN ", re.DOTALL)
+parentheses_or_comma_regexp = re.compile(r"[(),]")
+
 
 def coalesce(val, default=None):
     return default if val is None else val
@@ -31,44 +35,37 @@ def compare_dynamic_param_value(bp_value: Union[bool, int, float, str], existing
 def dtypes_from_arguments(arguments: str) -> str:
     all_dtypes = []
 
-    start_dtypes_idx = arguments.index("(")
-    finish_dtypes_idx = arguments.index(") RETURN ")
+    m = arguments_dtypes_regexp.match(arguments)
 
-    for dtype_part in split_by_comma_outside_parentheses(arguments[start_dtypes_idx + 1 : finish_dtypes_idx]):
-        # Remove optional DEFAULT prefix from the beginning
-        dtype_part = dtype_part.removeprefix("DEFAULT ")
+    if not m:
+        raise ValueError(f"Could not find data types in arguments [{arguments}]")
 
+    for dtype_part in split_by_comma_outside_parentheses(m.group(1)):
         # Remove optional data type size introduced in bundle 2025_03
         # https://docs.snowflake.com/en/release-notes/bcr-bundles/2025_03/bcr-1944
-        dtype_size_start_idx = dtype_part.find("(")
-
-        if dtype_size_start_idx > -1:
-            dtype_part = dtype_part[:dtype_size_start_idx]
-
-        all_dtypes.append(dtype_part)
+        # Remove optional DEFAULT prefix from the beginning
+        all_dtypes.append(dtype_part.partition("(")[0].removeprefix("DEFAULT "))
 
     return ",".join(all_dtypes)
 
 
 def split_by_comma_outside_parentheses(s: str):
     parts = []
-    current = []
     depth = 0
+    last_idx = 0
 
-    for char in s:
-        if char == "," and depth == 0:
-            parts.append("".join(current).strip())
-            current = []
-
-        else:
-            if char == "(":
-                depth += 1
-            elif char == ")":
-                depth -= 1
+    for m in parentheses_or_comma_regexp.finditer(s):
+        char = m.group()
 
-            current.append(char)
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0:
+            parts.append(s[last_idx : m.start()].strip())
+            last_idx = m.end()
 
-    if current:
-        parts.append("".join(current).strip())
+    if last_idx < len(s):
+        parts.append(s[last_idx:].strip())
 
     return parts
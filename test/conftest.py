@@ -1,12 +1,16 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from cryptography.hazmat.primitives import serialization
-from json import loads
-from itertools import groupby
+from functools import lru_cache
+from operator import itemgetter
 from os import environ
+import re
 from pytest import fixture
 from snowflake.connector import connect, DictCursor
 
 from snowddl import (
     BaseDataType,
+    DatabaseIdent,
     Edition,
     Ident,
     AccountObjectIdent,
@@ -18,23 +22,125 @@ from snowddl import (
 )
 from snowflake.connector.cursor import SnowflakeCursor
 
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+
+# Identifiers are re-created on every helper call with the same arguments, cache them to skip repeated validation
+@lru_cache(maxsize=4096)
+def _ident(name):
+    return Ident(name)
+
+
+@lru_cache(maxsize=4096)
+def _account_object_ident(env_prefix, name):
+    return AccountObjectIdent(env_prefix, name)
+
+
+@lru_cache(maxsize=4096)
+def _database_ident(env_prefix, database):
+    return DatabaseIdent(env_prefix, database)
+
+
+@lru_cache(maxsize=4096)
+def _schema_ident(env_prefix, database, schema):
+    return SchemaIdent(env_prefix, database, schema)
+
+
+@lru_cache(maxsize=4096)
+def _schema_object_ident(env_prefix, database, schema, name):
+    return SchemaObjectIdent(env_prefix, database, schema, name)
+
 
 class Helper:
     DEFAULT_ENV_PREFIX = "PYTEST"
 
+    GATHER_MAX_WORKERS = 8
+
+    PREFETCH_OBJECT_TYPES = ("TABLES", "VIEWS", "SEQUENCES", "FILE FORMATS", "PIPES", "STREAMS", "TASKS")
+
+    arguments_dtypes_regexp = re.compile(r"[^(]*\((.*?)\) RETURN ", re.DOTALL)
+    parentheses_or_comma_regexp = re.compile(r"[(),]")
+
     def __init__(self):
         self.connection = self._init_connection()
         self.env_prefix = self._init_env_prefix()
         self.formatter = SnowDDLFormatter()
 
-        self.edition = self._init_edition()
+        self._network_policy_cache = None
+        self._meta_cache = {}
 
+        self.edition, self.original_role = self._init_context()
         self._activate_role_with_prefix()
 
-    def execute(self, sql, params=None) -> SnowflakeCursor:
+    def execute(self, sql, params=None, dict_cursor=True) -> SnowflakeCursor:
         sql = self.formatter.format_sql(sql, params)
 
-        return self.connection.cursor(DictCursor).execute(sql)
+        if dict_cursor:
+            return self.connection.cursor(DictCursor).execute(sql)
+
+        return self.connection.cursor().execute(sql)
+
+    def _fetchone(self, sql, params=None):
+        return self.execute(sql, params).fetchone()
+
+    def batch_show(self, requests):
+        # Run multiple (sql, params) requests in a single round-trip, return list of rows for each request
+        # It is a standalone opt-in primitive, show_* helpers keep running their own queries
+        if not requests:
+            return []
+
+        sql = ";\n".join(self.formatter.format_sql(sql, params) for sql, params in requests)
+
+        cur = self.connection.cursor(DictCursor)
+        cur.execute(sql, num_statements=len(requests))
+
+        results = [cur.fetchall()]
+
+        while cur.nextset():
+            results.append(cur.fetchall())
+
+        return results
+
+    def gather(self, calls):
+        # Run independent helper calls concurrently, calls is a dict of {key: (func, *args)}, returns dict of {key: result}
+        with ThreadPoolExecutor(max_workers=self.GATHER_MAX_WORKERS, thread_name_prefix=self.__class__.__name__) as executor:
+            futures = {key: executor.submit(func, *args) for key, (func, *args) in calls.items()}
+
+            return {key: f.result() for key, f in futures.items()}
+
+    def prefetch_schema_metadata(self, database, schema):
+        # Load SHOW output for the whole schema once per object type, matching show_* helpers check it before SHOW ... LIKE
+        schema_name = _schema_ident(self.env_prefix, database, schema)
+
+        for object_type in self.PREFETCH_OBJECT_TYPES:
+            cur = self.execute(
+                "SHOW {object_type:r} IN SCHEMA {schema_name:i}",
+                {
+                    "object_type": object_type,
+                    "schema_name": schema_name,
+                },
+            )
+
+            self._meta_cache[(schema_name.database, schema_name.schema, object_type)] = self._rows_by_key(cur, "name")
+
+    def invalidate_schema_metadata(self, database=None, schema=None):
+        # Drop prefetched SHOW output for all schemas, for all schemas in database or for one specific schema
+        if database is None:
+            if schema is not None:
+                raise ValueError("Argument [database] is required to invalidate metadata of specific schema")
+
+            self._meta_cache = {}
+            return
+
+        database = _ident(database).name
+        schema = None if schema is None else _ident(schema).name
+
+        self._meta_cache = {
+            k: v for k, v in self._meta_cache.items() if k[0] != database or (schema is not None and k[1] != schema)
+        }
 
     def query_builder(self):
         return SnowDDLQueryBuilder(self.formatter)
@@ -42,7 +148,7 @@ class Helper:
     def desc_search_optimization(self, database, schema, name):
         cur = self.execute(
             "DESC SEARCH OPTIMIZATION ON {table_name:i}",
-            {"table_name": SchemaObjectIdent(self.env_prefix, database, schema, name)},
+            {"table_name": _schema_object_ident(self.env_prefix, database, schema, name)},
         )
 
         items = []
@@ -58,429 +164,387 @@ class Helper:
         return items
 
     def desc_table(self, database, schema, name):
-        cur = self.execute("DESC TABLE {name:i}", {"name": SchemaObjectIdent(self.env_prefix, database, schema, name)})
+        cur = self.execute("DESC TABLE {name:i}", {"name": _schema_object_ident(self.env_prefix, database, schema, name)})
 
-        return {r["name"]: r for r in cur}
+        return self._rows_by_key(cur, "name")
 
     def desc_view(self, database, schema, name):
-        cur = self.execute("DESC VIEW {name:i}", {"name": SchemaObjectIdent(self.env_prefix, database, schema, name)})
+        cur = self.execute("DESC VIEW {name:i}", {"name": _schema_object_ident(self.env_prefix, database, schema, name)})
 
-        return {r["name"]: r for r in cur}
+        return self._rows_by_key(cur, "name")
 
     def desc_external_access_integration(self, name):
-        cur = self.execute("DESC EXTERNAL ACCESS INTEGRATION {name:i}", {"name": AccountObjectIdent(self.env_prefix, name)})
+        cur = self.execute("DESC EXTERNAL ACCESS INTEGRATION {name:i}", {"name": _account_object_ident(self.env_prefix, name)})
 
-        return {r["property"]: r["property_value"] for r in cur}
+        return dict(map(itemgetter("property", "property_value"), cur))
 
     def desc_function(self, database, schema, name, dtypes):
         cur = self.execute(
             "DESC FUNCTION {name:i}", {"name": SchemaObjectIdentWithArgs(self.env_prefix, database, schema, name, dtypes)}
         )
 
-        return {r["property"]: r["value"] for r in cur}
+        return dict(map(itemgetter("property", "value"), cur))
+
+    def desc_functions_bulk(self, database, schema):
+        # Load basic properties of all functions in schema with one query, keyed by (name, argument signature)
+        cur = self.execute(
+            "SELECT function_name, argument_signature, data_type, function_definition, is_external, function_language "
+            "FROM {database_name:i}.information_schema.functions "
+            "WHERE function_schema = {schema_name}",
+            {
+                "database_name": _database_ident(self.env_prefix, database),
+                "schema_name": _ident(schema),
+            },
+        )
+
+        return self._rows_by_key(cur, "FUNCTION_NAME", "ARGUMENT_SIGNATURE")
 
     def desc_procedure(self, database, schema, name, dtypes):
         cur = self.execute(
             "DESC PROCEDURE {name:i}", {"name": SchemaObjectIdentWithArgs(self.env_prefix, database, schema, name, dtypes)}
         )
 
-        return {r["property"]: r["value"] for r in cur}
+        return dict(map(itemgetter("property", "value"), cur))
 
     def desc_file_format(self, database, schema, name):
-        cur = self.execute("DESC FILE FORMAT {name:i}", {"name": SchemaObjectIdent(self.env_prefix, database, schema, name)})
+        cur = self.execute("DESC FILE FORMAT {name:i}", {"name": _schema_object_ident(self.env_prefix, database, schema, name)})
 
-        return {r["property"]: r for r in cur}
+        return self._rows_by_key(cur, "property")
 
     def desc_authentication_policy(self, database, schema, name):
-        cur = self.execute("DESC AUTHENTICATION POLICY {name:i}", {"name": SchemaObjectIdent(self.env_prefix, database, schema, name)})
-
-        result = {}
-
-        for r in cur:
-            result[r["property"]] = r
+        cur = self.execute(
+            "DESC AUTHENTICATION POLICY {name:i}",
+            {"name": _schema_object_ident(self.env_prefix, database, schema, name)},
+        )
 
-        return result
+        return self._rows_by_key(cur, "property")
 
     def desc_network_policy(self, name):
-        cur = self.execute("DESC NETWORK POLICY {name:i}", {"name": AccountObjectIdent(self.env_prefix, name)})
+        cur = self.execute("DESC NETWORK POLICY {name:i}", {"name": _account_object_ident(self.env_prefix, name)})
 
-        return {r["name"]: r for r in cur}
+        return self._rows_by_key(cur, "name")
 
     def desc_network_rule(self, database, schema, name):
-        cur = self.execute("DESC NETWORK RULE {name:i}", {"name": SchemaObjectIdent(self.env_prefix, database, schema, name)})
-
-        return cur.fetchone()
+        return self._fetchone(
+            "DESC NETWORK RULE {name:i}", {"name": _schema_object_ident(self.env_prefix, database, schema, name)}
+        )
 
     def desc_stage(self, database, schema, name):
-        cur = self.execute("DESC STAGE {name:i}", {"name": SchemaObjectIdent(self.env_prefix, database, schema, name)})
+        cur = self.execute("DESC STAGE {name:i}", {"name": _schema_object_ident(self.env_prefix, database, schema, name)})
 
-        result = {}
+        result = defaultdict(dict)
 
         for r in cur:
-            if r["parent_property"] not in result:
-                result[r["parent_property"]] = {}
-
             result[r["parent_property"]][r["property"]] = r
 
-        return result
+        return dict(result)
 
     def get_policy_refs(self, database, schema, policy_name):
         cur = self.execute(
             "SELECT * FROM TABLE(snowflake.information_schema.policy_references(policy_name => {policy_name}))",
             {
-                "policy_name": SchemaObjectIdent(self.env_prefix, database, schema, policy_name),
+                "policy_name": _schema_object_ident(self.env_prefix, database, schema, policy_name),
             },
         )
 
-        refs = []
-
-        for r in cur:
-            refs.append(r)
-
-        return refs
+        return cur.fetchall()
 
     def get_network_policy_refs(self, policy_name):
         cur = self.execute(
             "SELECT * FROM TABLE(snowflake.information_schema.policy_references(policy_name => {policy_name}, policy_kind => {policy_kind}))",
             {
-                "policy_name": AccountObjectIdent(self.env_prefix, policy_name),
+                "policy_name": _account_object_ident(self.env_prefix, policy_name),
                 "policy_kind": "NETWORK_POLICY",
             },
         )
 
-        refs = []
-
-        for r in cur:
-            refs.append(r)
-
-        return refs
+        return cur.fetchall()
 
     def show_alert(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW ALERTS LIKE {alert_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "alert_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "alert_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_dynamic_table(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW DYNAMIC TABLES LIKE {table_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "table_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "table_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_event_table(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW EVENT TABLES LIKE {table_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "table_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "table_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_external_access_integration(self, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW EXTERNAL ACCESS INTEGRATIONS LIKE {name:lf}",
             {
-                "name": AccountObjectIdent(self.env_prefix, name),
+                "name": _account_object_ident(self.env_prefix, name),
             },
         )
 
-        return cur.fetchone()
-
     def show_sequence(self, database, schema, name):
-        cur = self.execute(
+        return self._show_schema_object(
+            "SEQUENCES",
             "SHOW SEQUENCES LIKE {sequence_name:lf} IN SCHEMA {schema_name:i}",
-            {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "sequence_name": Ident(name),
-            },
+            "sequence_name",
+            database,
+            schema,
+            name,
         )
 
-        return cur.fetchone()
-
     def show_stage(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW STAGES LIKE {stage_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "stage_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "stage_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_table(self, database, schema, name):
-        cur = self.execute(
-            "SHOW TABLES LIKE {table_name:lf} IN SCHEMA {schema_name:i}",
-            {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "table_name": Ident(name),
-            },
+        return self._show_schema_object(
+            "TABLES", "SHOW TABLES LIKE {table_name:lf} IN SCHEMA {schema_name:i}", "table_name", database, schema, name
         )
 
-        return cur.fetchone()
-
     def show_function(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW USER FUNCTIONS LIKE {function_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "function_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "function_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_procedure(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW USER PROCEDURES LIKE {procedure_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "procedure_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "procedure_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_file_format(self, database, schema, name):
-        cur = self.execute(
+        return self._show_schema_object(
+            "FILE FORMATS",
             "SHOW FILE FORMATS LIKE {format_name:lf} IN SCHEMA {schema_name:i}",
-            {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "format_name": Ident(name),
-            },
+            "format_name",
+            database,
+            schema,
+            name,
         )
 
-        return cur.fetchone()
-
     def show_pipe(self, database, schema, name):
-        cur = self.execute(
-            "SHOW PIPES LIKE {pipe_name:lf} IN SCHEMA {schema_name:i}",
-            {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "pipe_name": Ident(name),
-            },
+        return self._show_schema_object(
+            "PIPES", "SHOW PIPES LIKE {pipe_name:lf} IN SCHEMA {schema_name:i}", "pipe_name", database, schema, name
         )
 
-        return cur.fetchone()
-
     def show_stream(self, database, schema, name):
-        cur = self.execute(
-            "SHOW STREAMS LIKE {stream_name:lf} IN SCHEMA {schema_name:i}",
-            {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "stream_name": Ident(name),
-            },
+        return self._show_schema_object(
+            "STREAMS", "SHOW STREAMS LIKE {stream_name:lf} IN SCHEMA {schema_name:i}", "stream_name", database, schema, name
         )
 
-        return cur.fetchone()
-
     def show_task(self, database, schema, name):
-        cur = self.execute(
-            "SHOW TASKS LIKE {task_name:lf} IN SCHEMA {schema_name:i}",
-            {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "task_name": Ident(name),
-            },
+        return self._show_schema_object(
+            "TASKS", "SHOW TASKS LIKE {task_name:lf} IN SCHEMA {schema_name:i}", "task_name", database, schema, name
         )
 
-        return cur.fetchone()
-
     def show_task_parameters(self, database, schema, name):
         cur = self.execute(
             "SHOW PARAMETERS IN TASK {name:i}",
             {
-                "name": SchemaObjectIdent(self.env_prefix, database, schema, name),
+                "name": _schema_object_ident(self.env_prefix, database, schema, name),
             },
         )
 
-        return {r["key"]: r for r in cur}
+        return self._rows_by_key(cur, "key")
 
     def show_user(self, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW USERS LIKE {user_name:lf}",
             {
-                "user_name": AccountObjectIdent(self.env_prefix, name),
+                "user_name": _account_object_ident(self.env_prefix, name),
             },
         )
 
-        return cur.fetchone()
-
     def show_user_parameters(self, name):
         cur = self.execute(
             "SHOW PARAMETERS IN USER {name:i}",
             {
-                "name": AccountObjectIdent(self.env_prefix, name),
+                "name": _account_object_ident(self.env_prefix, name),
             },
         )
 
-        return {r["key"]: r for r in cur}
+        return self._rows_by_key(cur, "key")
 
     def show_view(self, database, schema, name):
-        cur = self.execute(
-            "SHOW VIEWS LIKE {view_name:lf} IN SCHEMA {schema_name:i}",
-            {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "view_name": Ident(name),
-            },
+        return self._show_schema_object(
+            "VIEWS", "SHOW VIEWS LIKE {view_name:lf} IN SCHEMA {schema_name:i}", "view_name", database, schema, name
         )
 
-        return cur.fetchone()
-
     def show_primary_key(self, database, schema, name):
         cur = self.execute(
             "SHOW PRIMARY KEYS IN TABLE {table_name:i}",
-            {"table_name": SchemaObjectIdent(self.env_prefix, database, schema, name)},
+            {"table_name": _schema_object_ident(self.env_prefix, database, schema, name)},
+            dict_cursor=False,
         )
 
-        sorted_cur = sorted(cur, key=lambda r: r["key_sequence"])
+        column_idx = {col.name: idx for idx, col in enumerate(cur.description)}
+        get_column_name = itemgetter(column_idx["column_name"])
+        get_key_sequence = itemgetter(column_idx["key_sequence"])
 
-        return [r["column_name"] for r in sorted_cur]
+        return [get_column_name(r) for r in sorted(cur, key=get_key_sequence)]
 
     def show_unique_keys(self, database, schema, name):
         cur = self.execute(
-            "SHOW UNIQUE KEYS IN TABLE {table_name:i}", {"table_name": SchemaObjectIdent(self.env_prefix, database, schema, name)}
+            "SHOW UNIQUE KEYS IN TABLE {table_name:i}",
+            {"table_name": _schema_object_ident(self.env_prefix, database, schema, name)},
         )
 
-        sorted_cur = sorted(cur, key=lambda r: (r["constraint_name"], r["key_sequence"]))
+        constraints = defaultdict(list)
+
+        for r in cur:
+            constraints[r["constraint_name"]].append(r)
+
+        uk = []
+
+        for rows in constraints.values():
+            rows.sort(key=lambda r: r["key_sequence"])
+            uk.append([r["column_name"] for r in rows])
 
-        return [[r["column_name"] for r in g] for k, g in groupby(sorted_cur, lambda r: r["constraint_name"])]
+        return uk
 
     def show_foreign_keys(self, database, schema, name):
         cur = self.execute(
             "SHOW IMPORTED KEYS IN TABLE {table_name:i}",
-            {"table_name": SchemaObjectIdent(self.env_prefix, database, schema, name)},
+            {"table_name": _schema_object_ident(self.env_prefix, database, schema, name)},
         )
 
-        sorted_cur = sorted(cur, key=lambda r: (r["fk_name"], r["key_sequence"]))
+        constraints = defaultdict(list)
+
+        for r in cur:
+            constraints[r["fk_name"]].append(r)
+
         fk = []
 
-        for k, g in groupby(sorted_cur, lambda r: r["fk_name"]):
-            g = list(g)
+        for g in constraints.values():
+            g.sort(key=lambda r: r["key_sequence"])
+            head = g[0]
 
             fk.append(
                 {
-                    "columns": [r["fk_column_name"] for r in g],
-                    "ref_table": f"{g[0]['pk_database_name']}.{g[0]['pk_schema_name']}.{g[0]['pk_table_name']}",
-                    "ref_columns": [r["pk_column_name"] for r in g],
+                    "columns": list(map(itemgetter("fk_column_name"), g)),
+                    "ref_table": f"{head['pk_database_name']}.{head['pk_schema_name']}.{head['pk_table_name']}",
+                    "ref_columns": list(map(itemgetter("pk_column_name"), g)),
                 }
             )
 
         return fk
 
     def show_authentication_policy(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW AUTHENTICATION POLICIES LIKE {object_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "object_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "object_name": _ident(name),
             }
         )
 
-        return cur.fetchone()
-
     def show_network_policy(self, name):
-        # SHOW NETWORK POLICIES does not support LIKE natively
-        cur = self.execute("SHOW NETWORK POLICIES")
+        # SHOW NETWORK POLICIES does not support LIKE natively, full output is loaded once and cached
+        if self._network_policy_cache is None:
+            cur = self.execute("SHOW NETWORK POLICIES")
+            self._network_policy_cache = self._rows_by_key(cur, "name")
 
-        for r in cur:
-            if r["name"] == str(AccountObjectIdent(self.env_prefix, name)):
-                return r
+        return self._network_policy_cache.get(str(_account_object_ident(self.env_prefix, name)))
+
+    def invalidate_network_policy_cache(self):
+        self._network_policy_cache = None
 
     def show_network_rule(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW NETWORK RULES LIKE {object_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "object_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "object_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_resource_monitor(self, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW RESOURCE MONITORS LIKE {name:lf}",
             {
-                "name": AccountObjectIdent(self.env_prefix, name),
+                "name": _account_object_ident(self.env_prefix, name),
             },
         )
 
-        return cur.fetchone()
-
     def show_secret(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW SECRETS LIKE {object_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "object_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "object_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_warehouse(self, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW WAREHOUSES LIKE {name:lf}",
             {
-                "name": AccountObjectIdent(self.env_prefix, name),
+                "name": _account_object_ident(self.env_prefix, name),
             },
         )
 
-        return cur.fetchone()
-
     def show_warehouse_parameters(self, name):
         cur = self.execute(
             "SHOW PARAMETERS IN WAREHOUSE {name:i}",
             {
-                "name": AccountObjectIdent(self.env_prefix, name),
+                "name": _account_object_ident(self.env_prefix, name),
             },
         )
 
-        return {r["key"]: r for r in cur}
+        return self._rows_by_key(cur, "key")
 
     def show_hybrid_table(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW HYBRID TABLES LIKE {object_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "object_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "object_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_iceberg_table(self, database, schema, name):
-        cur = self.execute(
+        return self._fetchone(
             "SHOW ICEBERG TABLES LIKE {object_name:lf} IN SCHEMA {schema_name:i}",
             {
-                "schema_name": SchemaIdent(self.env_prefix, database, schema),
-                "object_name": Ident(name),
+                "schema_name": _schema_ident(self.env_prefix, database, schema),
+                "object_name": _ident(name),
             },
         )
 
-        return cur.fetchone()
-
     def show_indexes(self, database, schema, name):
         cur = self.execute(
             "SHOW INDEXES IN TABLE {table_name:i}",
             {
-                "table_name": SchemaObjectIdent(self.env_prefix, database, schema, name),
+                "table_name": _schema_object_ident(self.env_prefix, database, schema, name),
             },
         )
 
-        return {r["name"]: r for r in cur}
+        return self._rows_by_key(cur, "name")
 
     def is_edition_enterprise(self):
         return self.edition >= Edition.ENTERPRISE
@@ -491,47 +555,63 @@ class Helper:
     def dtypes_from_arguments(self, arguments: str):
         all_dtypes = []
 
-        start_dtypes_idx = arguments.index("(")
-        finish_dtypes_idx = arguments.index(") RETURN ")
+        m = self.arguments_dtypes_regexp.match(arguments)
 
-        for dtype_part in self.split_by_comma_outside_parentheses(arguments[start_dtypes_idx + 1 : finish_dtypes_idx]):
-            # Remove optional DEFAULT prefix from the beginning
-            dtype_part = dtype_part.removeprefix("DEFAULT ")
+        if not m:
+            raise ValueError(f"Could not find data types in arguments [{arguments}]")
 
+        for dtype_part in self.split_by_comma_outside_parentheses(m.group(1)):
             # Remove optional data type size introduced in bundle 2025_03
             # https://docs.snowflake.com/en/release-notes/bcr-bundles/2025_03/bcr-1944
-            dtype_size_start_idx = dtype_part.find("(")
-
-            if dtype_size_start_idx > -1:
-                dtype_part = dtype_part[:dtype_size_start_idx]
-
-            all_dtypes.append(dtype_part)
+            # Remove optional DEFAULT prefix from the beginning
+            all_dtypes.append(dtype_part.partition("(")[0].removeprefix("DEFAULT "))
 
         return [BaseDataType[dtype] for dtype in all_dtypes]
 
     def split_by_comma_outside_parentheses(self, s: str):
         parts = []
-        current = []
         depth = 0
+        last_idx = 0
 
-        for char in s:
-            if char == "," and depth == 0:
-                parts.append("".join(current).strip())
-                current = []
+        for m in self.parentheses_or_comma_regexp.finditer(s):
+            char = m.group()
 
-            else:
-                if char == "(":
-                    depth += 1
-                elif char == ")":
-                    depth -= 1
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif depth == 0:
+                parts.append(s[last_idx : m.start()].strip())
+                last_idx = m.end()
 
-                current.append(char)
-
-        if current:
-            parts.append("".join(current).strip())
+        if last_idx < len(s):
+            parts.append(s[last_idx:].strip())
 
         return parts
 
+    def _rows_by_key(self, cur, *key):
+        rows = cur.fetchall()
+
+        return dict(zip(map(itemgetter(*key), rows), rows))
+
+    def _show_schema_object(self, object_type, sql, param_name, database, schema, name):
+        # Return object from prefetched SHOW output on hit, run SHOW ... LIKE on miss
+        schema_name = _schema_ident(self.env_prefix, database, schema)
+        object_name = _ident(name)
+
+        prefetched = self._meta_cache.get((schema_name.database, schema_name.schema, object_type), {})
+
+        if str(object_name) in prefetched:
+            return prefetched[str(object_name)]
+
+        return self._fetchone(
+            sql,
+            {
+                "schema_name": schema_name,
+                param_name: object_name,
+            },
+        )
+
     def __enter__(self):
         return self
 
@@ -552,30 +632,39 @@ class Helper:
             )
         }
 
+        if environ.get("SNOWFLAKE_ROLE"):
+            options["role"] = environ.get("SNOWFLAKE_ROLE")
+
         return connect(**options)
 
     def _init_env_prefix(self):
         return environ.get("SNOWFLAKE_ENV_PREFIX", self.DEFAULT_ENV_PREFIX).upper() + "__"
 
-    def _init_edition(self):
-        cur = self.execute("SELECT SYSTEM$BOOTSTRAP_DATA_REQUEST('ACCOUNT') AS bootstrap_account")
-        r = cur.fetchone()
+    def _init_context(self):
+        # Edition and current role are resolved with a single query under original role, before role with env prefix is activated
+        # Role is known in advance when passed explicitly, no need to ask Snowflake
+        current_role = environ.get("SNOWFLAKE_ROLE")
+
+        if current_role:
+            r = self._fetchone("SELECT SYSTEM$BOOTSTRAP_DATA_REQUEST('ACCOUNT') AS bootstrap_account")
+        else:
+            r = self._fetchone(
+                "SELECT CURRENT_ROLE() AS current_role, SYSTEM$BOOTSTRAP_DATA_REQUEST('ACCOUNT') AS bootstrap_account"
+            )
+            current_role = r["CURRENT_ROLE"]
 
         bootstrap_account = loads(r["BOOTSTRAP_ACCOUNT"])
 
-        return Edition[bootstrap_account["accountInfo"]["serviceLevelName"]]
+        return Edition[bootstrap_account["accountInfo"]["serviceLevelName"]], current_role
 
     def _activate_role_with_prefix(self):
         if not self.env_prefix:
             return
 
-        cur = self.execute("SELECT CURRENT_ROLE() AS current_role")
-        r = cur.fetchone()
-
         self.execute(
             "USE ROLE {role_with_prefix:i}",
             {
-                "role_with_prefix": AccountObjectIdent(self.env_prefix, r["CURRENT_ROLE"]),
+                "role_with_prefix": _account_object_ident(self.env_prefix, self.original_role),
             },
         )
 
@@ -1,7 +1,25 @@
+from snowddl import Ident, SchemaIdent
+
+
 def test_step1(helper):
-    for i in range(1, 5):
-        table = helper.show_table("db1", "sc1", f"cu001_tb{i}")
-        assert table is not None
+    results = helper.batch_show(
+        [
+            (
+                "SHOW TABLES LIKE {table_name:lf} IN SCHEMA {schema_name:i}",
+                {
+                    "schema_name": SchemaIdent(helper.env_prefix, "db1", "sc1"),
+                    "table_name": Ident(f"cu001_tb{i}"),
+                },
+            )
+            for i in range(1, 5)
+        ]
+    )
+
+    assert len(results) == 4
+
+    for i, rows in enumerate(results, start=1):
+        assert len(rows) == 1
+        assert rows[0]["name"] == f"CU001_TB{i}"
 
 
 def test_step2(helper):
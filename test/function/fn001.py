@@ -3,6 +3,7 @@ def test_step1(helper):
     function_dtypes = helper.dtypes_from_arguments(function_show["arguments"])
 
     function_desc = helper.desc_function("db1", "sc1", "fn001_fn1", function_dtypes)
+    function_bulk = helper.desc_functions_bulk("db1", "sc1")[("FN001_FN1", "()")]
 
     assert function_show["language"] == "SQL"
     # assert function_show["arguments"] == "FN001_FN1() RETURN NUMBER"
@@ -13,6 +14,9 @@ def test_step1(helper):
 
     assert function_desc["body"] == "123"
 
+    assert function_bulk["FUNCTION_LANGUAGE"] == "SQL"
+    assert function_bulk["FUNCTION_DEFINITION"] == function_desc["body"]
+
     assert function_show["description"].startswith("abc #")
 
 
@@ -6,6 +6,7 @@ EXCLUDE_OBJECT_TYPES="ICEBERG_TABLE"
 # - SNOWFLAKE_ACCOUNT
 # - SNOWFLAKE_USER
 # - SNOWFLAKE_PASSWORD
+# - SNOWFLAKE_ROLE (optional, skips CURRENT_ROLE() lookup in pytest helper)
 # - SNOWFLAKE_ENV_PREFIX
 # - SNOWFLAKE_ENV_ADMIN_ROLE
 
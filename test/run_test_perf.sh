@@ -4,6 +4,7 @@
 # - SNOWFLAKE_ACCOUNT
 # - SNOWFLAKE_USER
 # - SNOWFLAKE_PASSWORD
+# - SNOWFLAKE_ROLE (optional, skips CURRENT_ROLE() lookup in pytest helper)
 # - SNOWFLAKE_ENV_PREFIX
 # - SNOWFLAKE_ENV_ADMIN_ROLE
 
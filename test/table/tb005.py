@@ -2,9 +2,17 @@ from snowddl import SchemaObjectIdent
 
 
 def test_step1(helper):
-    pk = helper.show_primary_key("db1", "sc1", "tb005_tb2")
-    uk = helper.show_unique_keys("db1", "sc1", "tb005_tb2")
-    fk = helper.show_foreign_keys("db1", "sc1", "tb005_tb2")
+    keys = helper.gather(
+        {
+            "pk": (helper.show_primary_key, "db1", "sc1", "tb005_tb2"),
+            "uk": (helper.show_unique_keys, "db1", "sc1", "tb005_tb2"),
+            "fk": (helper.show_foreign_keys, "db1", "sc1", "tb005_tb2"),
+        }
+    )
+
+    pk = keys["pk"]
+    uk = keys["uk"]
+    fk = keys["fk"]
 
     assert pk == ["BOOK_ID"]
     assert uk == [["BOOK_ISBN"]]
@@ -19,9 +27,17 @@ def test_step1(helper):
 
 
 def test_step2(helper):
-    pk = helper.show_primary_key("db1", "sc1", "tb005_tb2")
-    uk = helper.show_unique_keys("db1", "sc1", "tb005_tb2")
-    fk = helper.show_foreign_keys("db1", "sc1", "tb005_tb2")
+    keys = helper.gather(
+        {
+            "pk": (helper.show_primary_key, "db1", "sc1", "tb005_tb2"),
+            "uk": (helper.show_unique_keys, "db1", "sc1", "tb005_tb2"),
+            "fk": (helper.show_foreign_keys, "db1", "sc1", "tb005_tb2"),
+        }
+    )
+
+    pk = keys["pk"]
+    uk = keys["uk"]
+    fk = keys["fk"]
 
     assert pk == ["STORE_ID", "BOOK_ID"]
     assert uk == [["STORE_ID", "BOOK_ISBN"]]
@@ -6,12 +6,16 @@ from json import loads
 
 
 def test_step1(helper):
+    helper.prefetch_schema_metadata("db1", "sc1")
+
     show_1 = helper.show_task("db1", "sc1", "ts002_ts1")
     show_2 = helper.show_task("db1", "sc1", "ts002_ts2")
     show_3 = helper.show_task("db1", "sc1", "ts002_ts3")
     show_4 = helper.show_task("db1", "sc1", "ts002_ts4")
     show_5 = helper.show_task("db1", "sc1", "ts002_ts5")
 
+    helper.invalidate_schema_metadata("db1", "sc1")
+
     assert show_5 is None
 
     predecessors_1 = loads(show_1["predecessors"])
@@ -38,12 +42,16 @@ def test_step1(helper):
 
 
 def test_step2(helper):
+    helper.prefetch_schema_metadata("db1", "sc1")
+
     show_1 = helper.show_task("db1", "sc1", "ts002_ts1")
     show_2 = helper.show_task("db1", "sc1", "ts002_ts2")
     show_3 = helper.show_task("db1", "sc1", "ts002_ts3")
     show_4 = helper.show_task("db1", "sc1", "ts002_ts4")
     show_5 = helper.show_task("db1", "sc1", "ts002_ts5")
 
+    helper.invalidate_schema_metadata("db1", "sc1")
+
     predecessors_1 = loads(show_1["predecessors"])
     predecessors_2 = loads(show_2["predecessors"])
     predecessors_3 = loads(show_3["predecessors"])